@@ -1,12 +1,57 @@
 import streamlit as st
 import pandas as pd
-from serpapi import GoogleSearch
-import google.generativeai as genai
+import httpx
 import math
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from functools import partial
+from itertools import chain
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="Review AI Analyst", page_icon="🧠", layout="wide")
 
+SERPAPI_URL = "https://serpapi.com/search.json"
+GEMINI_MODEL_NAME = "gemini-2.5-flash"
+
+# On-disk cache for Gemini reports and SerpApi pages, so they survive restarts
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "review-ai")
+CACHE_DB_PATH = os.path.join(CACHE_DIR, "exact.db")
+
+# Seconds a scraped review page is reused from disk
+PAGE_CACHE_TTL = 86400
+
+# Reviews are cut to MAX_REVIEW_CHARS before being sent to Gemini;
+# ones shorter than MIN_REVIEW_CHARS after cleaning are dropped
+MAX_REVIEW_CHARS = 400
+MIN_REVIEW_CHARS = 15
+
+# Google's "(Translated by Google) ... (Original) ..." wrapper: keep the translation
+# (in the requested language) and drop the original. Only applies to snippets that
+# start with the marker, so a literal "(Original)" in a normal review is left alone.
+_TRANSLATED_RE = re.compile(r"^\(Translated by Google\)\s*(.*?)\s*(?:\(Original\).*)?$", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# At most this many negative reviews per business are sent to Gemini
+MAX_NEGATIVE_REVIEWS = 60
+
+# Reviews at least this similar (cosine, bag-of-words) to another are sent once
+NEAR_DUPLICATE_SIMILARITY = 0.9
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+# Place IDs scraped at the same time
+MAX_CONCURRENT_SCRAPES = 5
+
+# Minimum seconds between progress bar redraws while scraping
+PROGRESS_UPDATE_INTERVAL = 0.25
+
 # --- DATA DICTIONARIES ---
 COUNTRY_CODES = {
     "United Kingdom": "gb",
@@ -31,6 +76,39 @@ LANGUAGE_CODES = {
     "Hindi": "hi"
 }
 
+# Columns of a scraped review
+REVIEW_COLUMNS = ["rating", "text", "date", "author"]
+
+# --- PROMPT TEMPLATES ---
+# Filled with str.format; {context} holds the formatted negative reviews
+COMPETITOR_PROMPT = """
+You are a Strategic Analyst. I have reviews for two companies.
+The reviews are in {lang}. Please provide your analysis in {lang}.
+
+{context}
+
+Please provide a comparison report in Markdown.
+1. **Top 5-10 Pain Points for {name_a}:** List the most critical recurring issues.
+2. **Top 5-10 Pain Points for {name_b}:** List the most critical recurring issues.
+3. **Comparison Verdict:** What is the main difference in why customers are unhappy?
+"""
+
+SINGLE_PROMPT = """
+You are a CX Analyst. Analyze these negative reviews.
+The reviews are in {lang}. Please provide your analysis in {lang}.
+
+{context}
+
+Identify the **Top 5 to 10** distinct customer pain points.
+Do not list fewer than 5 unless the data is extremely sparse.
+
+For each pain point, provide:
+1. **Title**: Short and punchy.
+2. **Frequency**: Estimate if this is High, Medium, or Low frequency.
+3. **Explanation**: A brief explanation of the issue.
+4. **Quote**: A direct quote from one of the reviews.
+"""
+
 # --- AUTHENTICATION ---
 try:
     GENAI_KEY = st.secrets["GEMINI_API_KEY"]
@@ -43,152 +121,408 @@ except KeyError:
 
 # --- HELPER FUNCTIONS ---
 
-def get_reviews(place_id, api_key, country_code, lang_code, target_count):
+@st.cache_resource
+def _get_gemini_model():
     """
-    Pulls reviews directly using a Place ID.
-    Loops until 'target_count' is reached or no more reviews exist.
+    Configures Gemini and builds the model once per process, shared across reruns.
+    The SDK is imported here so its heavy dependencies only load on first analysis.
     """
-    reviews_data = []
-    
-    # Calculate pages needed (10 reviews per page default)
-    max_pages = math.ceil(target_count / 10)
+    import google.generativeai as genai
     
-    # Initial Params
+    genai.configure(api_key=GENAI_KEY)
+    return genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+@st.cache_resource
+def get_cache_db():
+    """
+    Opens the cache database once per process, creating the tables on first use.
+    The connection is shared by every session, so it comes with a lock to guard it.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB_PATH, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, ts REAL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS review_pages (key TEXT PRIMARY KEY, results TEXT, ts REAL)"
+    )
+    return conn, threading.Lock()
+
+def _response_key(prompt, model_name):
+    """
+    Cache key for a report: the SHA-256 of the model name and the full prompt.
+    """
+    return hashlib.sha256(f"{model_name}\n{prompt}".encode()).hexdigest()
+
+def get_cached_response(prompt, model_name):
+    """
+    Returns a previously generated report for this exact prompt and model, or None.
+    Cache errors are treated as a miss so analysis never breaks on them.
+    """
+    key = _response_key(prompt, model_name)
+    try:
+        conn, lock = get_cache_db()
+        with lock:
+            row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    return row[0] if row else None
+
+def save_cached_response(prompt, model_name, response):
+    """
+    Stores a generated report for this prompt and model.
+    """
+    key = _response_key(prompt, model_name)
+    try:
+        conn, lock = get_cache_db()
+        with lock, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+def get_cached_page(key):
+    """
+    Returns a SerpApi page stored less than PAGE_CACHE_TTL seconds ago, or None.
+    """
+    try:
+        conn, lock = get_cache_db()
+        with lock:
+            row = conn.execute(
+                "SELECT results FROM review_pages WHERE key = ? AND ts > ?",
+                (key, time.time() - PAGE_CACHE_TTL),
+            ).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    return json.loads(row[0]) if row else None
+
+def save_cached_page(key, results):
+    """
+    Stores a SerpApi page as JSON, pruning pages older than PAGE_CACHE_TTL.
+    """
+    now = time.time()
+    try:
+        conn, lock = get_cache_db()
+        with lock, conn:
+            conn.execute("DELETE FROM review_pages WHERE ts <= ?", (now - PAGE_CACHE_TTL,))
+            conn.execute(
+                "INSERT OR REPLACE INTO review_pages (key, results, ts) VALUES (?, ?, ?)",
+                (key, json.dumps(results), now),
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+def clear_cached_pages():
+    """
+    Drops every stored SerpApi page, in memory and on disk.
+    """
+    fetch_review_page.clear()
+    try:
+        conn, lock = get_cache_db()
+        with lock, conn:
+            conn.execute("DELETE FROM review_pages")
+    except (sqlite3.Error, OSError):
+        pass
+
+@st.cache_resource
+def _serp_client():
+    """
+    One pooled HTTP/2 client for every SerpApi request, so pages and places
+    reuse the same connection instead of a new TLS handshake each time.
+    """
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        timeout=30,
+    )
+
+def _serp_get(params):
+    """
+    Sends a SerpApi search and returns the parsed JSON.
+    Raises with SerpApi's own message when the response carries an error.
+    """
+    response = _serp_client().get(SERPAPI_URL, params=params)
+    try:
+        results = response.json()
+    except ValueError:
+        # Not JSON (e.g. a gateway error page). Report only the status code:
+        # httpx's own errors include the request URL, and with it the API key.
+        raise RuntimeError(f"SerpApi returned HTTP {response.status_code}") from None
+    if "error" in results:
+        raise RuntimeError(results["error"])
+    return results
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_review_page(place_id, country_code, lang_code, api_key_hash, _api_key, next_page_token=None):
+    """
+    Fetches a single page of reviews from SerpApi.
+    Cached for an hour in memory and for a day on disk so repeat runs don't spend
+    credits. Entries are keyed on a hash of the API key rather than the key itself,
+    and error responses raise so they are never cached.
+    """
+    page_key = hashlib.sha256(
+        json.dumps([place_id, country_code, lang_code, api_key_hash, next_page_token]).encode()
+    ).hexdigest()
+    cached = get_cached_page(page_key)
+    if cached is not None:
+        return cached
+
     params = {
         "engine": "google_maps_reviews",
         "place_id": place_id,
-        "api_key": api_key,
+        "api_key": _api_key,
         "sort_by": "newestFirst",
         "gl": country_code,
         "hl": lang_code,
         # 'num' is purposefully omitted here to avoid page 1 errors
     }
+
+    # --- PAGINATION FIX ---
+    # Keep 'place_id' in params alongside the token so the API knows the context.
+    if next_page_token:
+        params["next_page_token"] = next_page_token
+
+    results = _serp_get(params)
+    save_cached_page(page_key, results)
+    return results
+
+def reviews_to_frame(rows):
+    """
+    Builds a DataFrame of review dicts for display, with a fixed column schema.
+    """
+    df = pd.DataFrame.from_records(rows, columns=REVIEW_COLUMNS)
     
-    try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
-    except Exception as e:
-        st.error(f"Error fetching data from SerpApi: {e}")
-        return pd.DataFrame()
+    # Nullable 1-byte ints: ratings are 1-5 and may be missing
+    return df.astype({"rating": "Int8"})
+
+async def get_reviews_async(place_id, api_key, country_code, lang_code, target_count,
+                            on_progress=None, on_rows=None):
+    """
+    Pulls reviews directly using a Place ID.
+    Loops until 'target_count' is reached or no more reviews exist.
+    Returns a list of review dicts; callers build a DataFrame only to display it.
+    'on_progress' is called with the number of reviews collected so far and
+    'on_rows' with a DataFrame of each new page, for live display.
+    """
+    reviews_data = []
+    collected = 0
+    
+    # Calculate pages needed (10 reviews per page default)
+    max_pages = (target_count + 9) // 10
     
     page_count = 0
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    ctx = get_script_run_ctx()
     
-    while page_count < max_pages:
-        # Update Progress UI
-        current_len = len(reviews_data)
-        progress_val = min(current_len / target_count, 1.0)
-        progress_bar.progress(progress_val)
-        status_text.caption(f"Fetching reviews... ({current_len}/{target_count} collected)")
-        
-        # Check for API errors
-        if "error" in results:
-            st.error(f"SerpApi Error on page {page_count+1}: {results['error']}")
-            break
+    def fetch(next_page_token):
+        # Runs on a worker thread; attach the script context the page cache expects
+        add_script_run_ctx(ctx=ctx)
+        return fetch_review_page(place_id, country_code, lang_code, api_key_hash, api_key, next_page_token)
+    
+    # run_in_executor submits to the thread pool immediately, so a prefetch really
+    # downloads while this coroutine keeps parsing and drawing the current page
+    loop = asyncio.get_running_loop()
+    page_future = loop.run_in_executor(None, fetch, None)
+    
+    try:
+        while page_future is not None:
+            # Update Progress UI
+            if on_progress:
+                on_progress(collected)
             
-        new_reviews = results.get("reviews", [])
-        
-        # If no reviews returned, stop
-        if not new_reviews:
-            break
-
-        # Append new reviews
-        for review in new_reviews:
-            reviews_data.append({
-                "rating": review.get("rating"),
-                "text": review.get("snippet", ""),
-                "date": review.get("date"),
-                "author": review.get("user", {}).get("name")
-            })
+            try:
+                results = await page_future
+            except Exception as e:
+                st.error(f"SerpApi Error on page {page_count+1}: {e}")
+                break
+            page_count += 1
+            page_future = None
             
-        # Stop if we have enough
-        if len(reviews_data) >= target_count:
-            break
-        
-        # Pagination Check
-        if "serpapi_pagination" not in results: 
-            break
-        if "next_page_token" not in results["serpapi_pagination"]: 
-            break
+            new_reviews = results.get("reviews", [])
             
-        page_count += 1
-        
-        # --- PAGINATION FIX ---
-        # 1. Update the token
-        params["next_page_token"] = results["serpapi_pagination"]["next_page_token"]
+            # Pagination Check
+            # Request the next page now so it downloads while this one is parsed,
+            # but only if this page doesn't already reach the target
+            next_page_token = results.get("serpapi_pagination", {}).get("next_page_token")
+            if (next_page_token and new_reviews and page_count < max_pages
+                    and collected + len(new_reviews) < target_count):
+                page_future = loop.run_in_executor(None, fetch, next_page_token)
+            
+            # If no reviews returned, stop
+            if not new_reviews:
+                break
+
+            # Append new reviews
+            page_rows = [
+                {
+                    "rating": review.get("rating"),
+                    "text": review.get("snippet", ""),
+                    "date": review.get("date"),
+                    "author": review.get("user", {}).get("name")
+                }
+                for review in new_reviews
+            ]
+            reviews_data.extend(page_rows)
+            collected += len(page_rows)
+            
+            if on_rows:
+                on_rows(reviews_to_frame(page_rows))
+                
+            # Stop if we have enough
+            if collected >= target_count:
+                break
+    finally:
+        if page_future is not None:
+            page_future.cancel()
+    
+    return reviews_data[:target_count]
+
+async def scrape_all(jobs, api_key, country_code, lang_code, target_count,
+                     on_progress=None, on_rows=None, on_done=None, max_concurrency=MAX_CONCURRENT_SCRAPES):
+    """
+    Scrapes several Place IDs concurrently, at most 'max_concurrency' at a time.
+    'jobs' maps a display name to a Place ID. Returns a name -> reviews dict in
+    the same order; the callbacks are those of get_reviews_async with the name first,
+    and 'on_done' is called with (name, reviews) as each place finishes.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def scrape_one(name, place_id):
+        report = partial(on_progress, name) if on_progress else None
+        show = partial(on_rows, name) if on_rows else None
+        async with semaphore:
+            reviews = await get_reviews_async(place_id, api_key, country_code, lang_code, target_count, report, show)
+        return name, reviews
+
+    results = {}
+    for finished in asyncio.as_completed([scrape_one(name, place_id) for name, place_id in jobs.items()]):
+        name, reviews = await finished
+        results[name] = reviews
+        if on_done:
+            on_done(name, reviews)
+    return {name: results[name] for name in jobs}
+
+@st.cache_data(ttl=3600, max_entries=100, show_spinner=False)
+def dedupe_reviews(texts, threshold=NEAR_DUPLICATE_SIMILARITY):
+    """
+    Drops reviews that repeat an earlier one.
+    Reviews are compared as bag-of-words vectors (ignoring case and punctuation);
+    one with a cosine similarity of at least 'threshold' to a review already kept
+    is treated as a near-duplicate. Reviews with no words at all (emoji or
+    punctuation only) are matched exactly instead. Cached on the review texts,
+    so reruns skip it.
+    """
+    kept = []
+    vectors = []
+    seen_wordless = set()
+    for text in texts:
+        words = Counter(_NON_WORD_RE.sub(" ", text.lower()).split())
+        norm = math.sqrt(sum(count * count for count in words.values()))
         
-        # 2. DO NOT delete place_id. 
-        # Keep 'place_id' in params so the API knows the context.
+        if not norm:
+            key = " ".join(text.split())
+            if key in seen_wordless:
+                continue
+            seen_wordless.add(key)
+            kept.append(text)
+            continue
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        is_duplicate = any(
+            sum(count * other.get(word, 0) for word, count in words.items()) / (norm * other_norm) >= threshold
+            for other, other_norm in vectors
+        )
+        if is_duplicate:
+            continue
         
-    progress_bar.empty()
-    status_text.empty()
-    
-    return pd.DataFrame(reviews_data[:target_count])
+        kept.append(text)
+        vectors.append((words, norm))
+    return kept
 
-def analyze_with_gemini(data_dict, lang_name):
+def _build_prompt(data_dict, lang_name):
     """
-    Analyzes reviews using Gemini.
+    Builds the Gemini prompt from the negative reviews of each business.
+    'data_dict' maps a business name to its list of review dicts.
+    Returns None when no business has any negative reviews to analyze.
     """
-    genai.configure(api_key=GENAI_KEY)
-    model = genai.GenerativeModel('gemini-2.5-flash')
-    
     # Prepare text for prompt
-    prompt_context = ""
-    for name, df in data_dict.items():
-        # Filter for negative reviews (1-3 stars)
-        neg_reviews = df[df['rating'] <= 3]['text'].tolist()
+    context_parts = []
+    total_neg = 0
+    for name, rows in data_dict.items():
+        # Filter for negative reviews (1-3 stars), skipping empty ones
+        # Missing ratings count as positive
+        neg_texts = [r["text"] for r in rows if (r["rating"] or 5) <= 3 and r["text"]]
+        
+        # Strip translation boilerplate and extra whitespace; very short reviews carry little signal
+        neg_texts = (_WHITESPACE_RE.sub(" ", _TRANSLATED_RE.sub(r"\1", t)).strip() for t in neg_texts)
+        neg_texts = [t for t in neg_texts if len(t) >= MIN_REVIEW_CHARS]
+        
+        # Cap the length of reviews, drop duplicates, then cap the number to save prompt tokens
+        neg_reviews = dedupe_reviews([t[:MAX_REVIEW_CHARS] for t in neg_texts])[:MAX_NEGATIVE_REVIEWS]
         
         if not neg_reviews:
-            prompt_context += f"\n\n--- REVIEWS FOR {name.upper()} ---\n(No negative reviews found)\n"
+            context_parts.append(f"\n\n--- REVIEWS FOR {name.upper()} ---\n(No negative reviews found)\n")
             continue
 
-        # --- UNLOCKED LIMIT ---
-        # Send ALL negative reviews found to Gemini
-        formatted_reviews = "\n".join([f"- {r}" for r in neg_reviews])
+        total_neg += len(neg_reviews)
+        formatted_reviews = "\n".join(f"- {r}" for r in neg_reviews)
         
-        prompt_context += f"\n\n--- REVIEWS FOR {name.upper()} ---\n{formatted_reviews}\n"
+        context_parts.append(f"\n\n--- REVIEWS FOR {name.upper()} ---\n{formatted_reviews}\n")
+    
+    # Nothing for Gemini to find, skip the API call
+    if not total_neg:
+        return None
+    
+    prompt_context = "".join(context_parts)
 
     # --- PROMPTS ---
     if len(data_dict) > 1:
         # COMPETITOR MODE
-        prompt = f"""
-        You are a Strategic Analyst. I have reviews for two companies.
-        The reviews are in {lang_name}. Please provide your analysis in {lang_name}.
-        
-        {prompt_context}
-        
-        Please provide a comparison report in Markdown.
-        1. **Top 5-10 Pain Points for {list(data_dict.keys())[0]}:** List the most critical recurring issues.
-        2. **Top 5-10 Pain Points for {list(data_dict.keys())[1]}:** List the most critical recurring issues.
-        3. **Comparison Verdict:** What is the main difference in why customers are unhappy?
-        """
+        names = list(data_dict.keys())
+        prompt = COMPETITOR_PROMPT.format(lang=lang_name, context=prompt_context, name_a=names[0], name_b=names[1])
     else:
         # SINGLE MODE
-        prompt = f"""
-        You are a CX Analyst. Analyze these negative reviews.
-        The reviews are in {lang_name}. Please provide your analysis in {lang_name}.
-        
-        {prompt_context}
-        
-        Identify the **Top 5 to 10** distinct customer pain points.
-        Do not list fewer than 5 unless the data is extremely sparse.
-        
-        For each pain point, provide:
-        1. **Title**: Short and punchy.
-        2. **Frequency**: Estimate if this is High, Medium, or Low frequency.
-        3. **Explanation**: A brief explanation of the issue.
-        4. **Quote**: A direct quote from one of the reviews.
-        """
+        prompt = SINGLE_PROMPT.format(lang=lang_name, context=prompt_context)
+
+    return prompt
+
+def _call_gemini(prompt, model_name):
+    """
+    Streams Gemini's answer to the prompt, serving repeats from the response cache.
+    The prompt already encodes the reviews, language and mode, so it is the cache key.
+    The model (and the SDK) is only loaded on a cache miss.
+    """
+    cached = get_cached_response(prompt, model_name)
+    if cached is not None:
+        yield cached
+        return
 
+    chunks = []
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        response = _get_gemini_model().generate_content(prompt, stream=True)
+        for chunk in response:
+            if not chunk.text:
+                continue
+            chunks.append(chunk.text)
+            yield chunk.text
     except Exception as e:
-        return f"AI Error: {str(e)}"
+        yield f"AI Error: {str(e)}"
+        return
+
+    # Only complete, non-empty reports are cached
+    if chunks:
+        save_cached_response(prompt, model_name, "".join(chunks))
+
+def analyze_with_gemini(data_dict, lang_name):
+    """
+    Analyzes reviews using Gemini.
+    Returns a generator of report chunks as Gemini streams them back.
+    """
+    prompt = _build_prompt(data_dict, lang_name)
+    if prompt is None:
+        return iter(["No negative reviews (rating ≤ 3) found across the provided businesses."])
+    return _call_gemini(prompt, GEMINI_MODEL_NAME)
 
 # --- MAIN UI ---
 st.title("📍 Google reviews analyser: Customer pain points")
@@ -214,6 +548,9 @@ with st.sidebar:
     st.header("📊 Data Volume")
     target_count = st.slider("Reviews to Analyze", min_value=10, max_value=100, value=30, step=10, 
                              help="Higher number = More accuracy but uses more credits.")
+    
+    force_refresh = st.checkbox("Force refresh", value=False,
+                                help="Ignore cached reviews (kept for up to a day) and fetch fresh ones from SerpApi.")
 
 # HELPER TEXT
 st.info("💡 Don't know the Place ID? Use the [Google Place ID Finder](https://developers.google.com/maps/documentation/places/web-service/place-id) to find it.")
@@ -236,28 +573,64 @@ if st.button("Analyze Reviews", type="primary"):
     else:
         results_store = {}
         
+        if force_refresh:
+            clear_cached_pages()
+        
         try:
             with st.status("🚀 Starting Analysis...", expanded=True) as status:
                 
-                # 1. SCRAPE MAIN BUSINESS
+                # 1. SCRAPE MAIN BUSINESS + COMPETITOR IN PARALLEL
+                # Both pipelines are independent SerpApi calls, so run them side by side
+                jobs = {target_name: target_id}
                 status.write(f"Fetching {target_count} reviews for ID: {target_id}...")
-                df_target = get_reviews(target_id, user_api_key, country_code, lang_code, target_count)
+                if competitor_id:
+                    jobs[competitor_name] = competitor_id
+                    status.write(f"Fetching reviews for Competitor ID: {competitor_id}...")
+                
+                # Pre-create the progress UI; the scrapers only update these placeholders
+                progress_ui = {name: (st.progress(0), st.empty(), st.empty()) for name in jobs}
+                live_tables = {}
+                last_progress_update = {}
                 
-                if not df_target.empty:
-                    results_store[target_name] = df_target
-                    status.write(f"✅ Loaded {len(df_target)} reviews.")
-                else:
+                def report_progress(name, collected):
+                    # Throttle redraws; each one is a websocket message to the browser
+                    now = time.monotonic()
+                    if now - last_progress_update.get(name, float("-inf")) < PROGRESS_UPDATE_INTERVAL:
+                        return
+                    last_progress_update[name] = now
+                    
+                    progress_bar, status_text, _ = progress_ui[name]
+                    progress_bar.progress(min(collected / target_count, 1.0))
+                    status_text.caption(f"Fetching reviews for {name}... ({collected}/{target_count} collected)")
+                
+                def show_rows(name, rows):
+                    # Stream each page into a live table as it arrives
+                    if name in live_tables:
+                        live_tables[name].add_rows(rows)
+                    else:
+                        live_tables[name] = progress_ui[name][2].dataframe(rows, use_container_width=True)
+                
+                def report_done(name, rows):
+                    # The full tables are shown under "View Raw Data" instead
+                    for placeholder in progress_ui[name]:
+                        placeholder.empty()
+                    if rows:
+                        label = "competitor reviews" if name == competitor_name else "reviews"
+                        status.write(f"✅ Loaded {len(rows)} {label}.")
+                
+                scraped = asyncio.run(
+                    scrape_all(jobs, user_api_key, country_code, lang_code, target_count,
+                               report_progress, show_rows, report_done)
+                )
+                scraped = {name: rows for name, rows in scraped.items() if rows}
+                
+                if target_name not in scraped:
                     status.update(label="Failed to load reviews", state="error")
                     st.error("No reviews found. Check the Place ID.")
                     st.stop()
-
-                # 2. SCRAPE COMPETITOR
-                if competitor_id:
-                    status.write(f"Fetching reviews for Competitor ID: {competitor_id}...")
-                    df_comp = get_reviews(competitor_id, user_api_key, country_code, lang_code, target_count)
-                    if not df_comp.empty:
-                        results_store[competitor_name] = df_comp
-                        status.write(f"✅ Loaded {len(df_comp)} competitor reviews.")
+                
+                # Keep the main business first, the comparison prompt relies on the order
+                results_store = {name: scraped[name] for name in jobs if name in scraped}
                 
                 status.update(label="Scraping Complete! Running AI Analysis...", state="complete")
 
@@ -265,18 +638,20 @@ if st.button("Analyze Reviews", type="primary"):
             if results_store:
                 st.divider()
                 st.subheader("🧠 Top Pain Points Report")
+                # Spin only until the first chunk arrives, then let the report stream in
                 with st.spinner("Generating insights..."):
-                    analysis = analyze_with_gemini(results_store, selected_lang_name)
-                st.markdown(analysis)
+                    stream = analyze_with_gemini(results_store, selected_lang_name)
+                    first_chunk = next(stream, "")
+                st.write_stream(chain([first_chunk], stream))
                 
                 # 4. RAW DATA
                 with st.expander("View Raw Data"):
                     tab1, tab2 = st.tabs(["Main Business", "Competitor"])
                     with tab1:
-                        st.dataframe(results_store[target_name])
+                        st.dataframe(reviews_to_frame(results_store[target_name]))
                     with tab2:
                         if competitor_name in results_store:
-                            st.dataframe(results_store[competitor_name])
+                            st.dataframe(reviews_to_frame(results_store[competitor_name]))
                         else:
                             st.write("No competitor data.")
 